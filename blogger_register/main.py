@@ -1,26 +1,110 @@
 ﻿import base64
+import functools
+import json
+import logging
 import os
+import queue
 import smtplib
-import time
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
+import sys
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from email.message import EmailMessage
 from typing import Any, TypedDict
 
 import google.auth
-from google.auth.transport.requests import AuthorizedSession
+import httplib2
+import jinja2
+from google.api_core.exceptions import Aborted, DeadlineExceeded, ServiceUnavailable
+from google.api_core.retry import Retry, if_exception_type
+from google.auth.credentials import Credentials
 from google.cloud import firestore
-from googleapiclient.discovery import build
+from google_auth_httplib2 import AuthorizedHttp
+from googleapiclient.discovery import Resource, build
+from googleapiclient.errors import BatchError, HttpError
 
 # 定数定義
 SCOPES: list[str] = ["https://www.googleapis.com/auth/indexing"]
-ENDPOINT: str = "https://indexing.googleapis.com/v3/urlNotifications:publish"
 BATCH_SIZE: int = 5
-SLEEP_SECONDS: int = 10  # API制限緩和のための待機時間(秒)
+INDEXING_BATCH_LIMIT: int = 100  # Indexing APIの1バッチリクエストあたりの最大通知数
+INDEXING_MAX_WORKERS: int = 4  # Indexing APIへのバッチリクエストの最大同時実行数
+INDEXING_HTTP_TIMEOUT_SECONDS: int = 60  # Indexing APIとの通信のタイムアウト(秒)
+MAIN_MAX_WORKERS: int = 3  # メイン処理で並行実行するネットワーク処理の最大数
 SMTP_SERVER = "smtp.gmail.com"
 SMTP_PORT = 587
+SMTP_TIMEOUT_SECONDS: int = 30  # SMTPサーバーとの通信のタイムアウト(秒)
 HTTP_STATUS_OK = 200
+HTTP_STATUS_NO_RESPONSE = 0  # HTTPレスポンスを受信できなかった場合のステータスコード
+SMTP_STATUS_OK = 250
+BLOGGER_MAX_RESULTS: int = 500  # Blogger APIの1ページあたりの取得件数
+FIRESTORE_BATCH_LIMIT: int = 400  # Firestoreの1バッチあたりの最大書き込み数
+COMMIT_THREADS: int = 10  # Firestoreへのコミットを並列実行するスレッド数
+COMMIT_RETRY = Retry(
+    predicate=if_exception_type(Aborted, DeadlineExceeded, ServiceUnavailable),
+)  # 一時的なエラーで失敗したコミットの再試行設定
+
+# 実行ログは標準出力に出力する。書式化はログ出力時まで遅延される
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+log_handler = logging.StreamHandler(sys.stdout)
+log_handler.setFormatter(logging.Formatter("%(message)s"))
+logger.addHandler(log_handler)
+logger.propagate = False
 
 db = firestore.Client()
+# ログイン済みのSMTP接続。ウォームインスタンスでは呼び出しをまたいで再利用する
+smtp_connections: dict[str, smtplib.SMTP] = {}
+# Indexing APIへのバッチリクエスト用のHTTP接続。keep-aliveした接続を使い回す
+indexing_http_pool: queue.SimpleQueue[AuthorizedHttp] = queue.SimpleQueue()
+
+# 結果メール本文のテンプレート
+SUMMARY_EMAIL_TEMPLATE_NAME = "summary_email.html"
+SUMMARY_EMAIL_TEMPLATE_SOURCE = """
+    <html>
+      <head>
+        <style>
+          table.result-table {
+            border-collapse: separate;
+            border-spacing: 0;
+            width: 100%;
+            font-family: 'Segoe UI', 'Meiryo', sans-serif;
+            box-shadow: 0 2px 8px #eee;
+            border-radius: 8px;
+            overflow: hidden;
+          }
+          .result-table th, .result-table td {
+            border: 1px solid #ccc;
+            padding: 8px 12px;
+            text-align: left;
+          }
+          .result-table th {
+            background: #4f81bd;
+            color: #fff;
+            font-weight: bold;
+          }
+          .result-table tr:hover {
+            background: #f1f7ff;
+          }
+        </style>
+      </head>
+      <body>
+        <h2 style='font-family:Segoe UI,Meiryo,sans-serif;'>インデックス通知バッチ結果</h2>
+        <table class='result-table'>
+          <tr>
+            <th>URL</th><th>結果</th><th>HTTPステータス</th><th>メッセージ</th>
+          </tr>
+          {% for r in results %}
+          {% set ok = r.status == "success" %}
+          <tr style='background-color:{{ "#eafbea" if ok else "#ffeaea" }};'>
+            <td style='word-break:break-all;'>{{ r.url }}</td>
+            <td style='font-weight:bold;color:{{ "#218838" if ok else "#c82333" }};'>{{ "成功" if ok else "失敗" }}</td>
+            <td>{{ r.http_status }}</td>
+            <td><pre style='white-space:pre-wrap;margin:0;font-family:inherit;'>{{ r.message }}</pre></td>
+          </tr>
+          {% endfor %}
+        </table>
+      </body>
+    </html>
+"""  # noqa: E501
 
 
 class EnvVars(TypedDict):
@@ -38,6 +122,54 @@ class NotificationResult(TypedDict):
     message: str
 
 
+class MinifyLoader(jinja2.BaseLoader):
+    """読み込んだテンプレートのソースから、行頭・行末の空白と空行を取り除くローダー。
+
+    行の区切りには改行を1つ残すため、複数行にまたがるテキストやJinjaの式も
+    そのまま扱える。最小化はテンプレートの読み込み時に一度だけ行われ、
+    描画時には影響しない。
+    """
+
+    def __init__(self, loader: jinja2.BaseLoader) -> None:
+        """ローダーを初期化する。
+
+        Args:
+            loader (jinja2.BaseLoader): 元のテンプレートを読み込むローダー
+        """
+        self.loader = loader
+
+    def get_source(
+        self,
+        environment: jinja2.Environment,
+        template: str,
+    ) -> tuple[str, str | None, Callable[[], bool] | None]:
+        """元のローダーからテンプレートのソースを取得し、最小化して返す。
+
+        Args:
+            environment (jinja2.Environment): テンプレートの環境
+            template (str): テンプレート名
+
+        Returns:
+            Tuple[str, str | None, Callable[[], bool] | None]:
+                (最小化したソース, ファイル名, 更新確認用の関数)
+        """
+        source, filename, uptodate = self.loader.get_source(environment, template)
+        lines = (line.strip() for line in source.splitlines())
+        minified = "\n".join(line for line in lines if line)
+        return minified, filename, uptodate
+
+
+# テンプレートはモジュール読み込み時に一度だけ最小化・コンパイルする
+jinja_env = jinja2.Environment(
+    loader=MinifyLoader(
+        jinja2.DictLoader({SUMMARY_EMAIL_TEMPLATE_NAME: SUMMARY_EMAIL_TEMPLATE_SOURCE}),
+    ),
+    autoescape=True,
+    trim_blocks=True,
+)
+SUMMARY_EMAIL_TEMPLATE = jinja_env.get_template(SUMMARY_EMAIL_TEMPLATE_NAME)
+
+
 def get_env_vars() -> EnvVars:
     """必要な環境変数を取得し、存在しない場合は例外を投げる。
 
@@ -61,68 +193,259 @@ def get_env_vars() -> EnvVars:
     return env
 
 
+@functools.lru_cache(maxsize=4096)
 def encode_doc_id(url: str) -> str:
     """URLをBase64 URLセーフエンコードしてFirestoreのドキュメントIDに変換する。
 
+    変換結果はキャッシュされ、同じURLの再変換を省略する。
+
     Args:
         url (str): エンコード対象のURL
 
     Returns:
         str: エンコード後の文字列
     """
-    return base64.urlsafe_b64encode(url.encode("utf-8")).decode("utf-8")
+    # Base64の出力はASCII文字のみのため、ASCIIとしてデコードする
+    return base64.urlsafe_b64encode(url.encode("utf-8")).decode("ascii")
+
+
+@functools.cache
+def get_indexing_credentials() -> Credentials:
+    """Indexing API用の認証情報を取得する。
+
+    取得結果はキャッシュされ、ウォームインスタンスでは呼び出しをまたいで再利用される。
+
+    Returns:
+        Credentials: SCOPESを指定して取得した認証情報
+    """
+    credentials, _ = google.auth.default(scopes=SCOPES)
+    return credentials
+
+
+@functools.cache
+def get_indexing_service() -> Resource:
+    """Indexing APIのサービスオブジェクトを取得する。
+
+    取得結果はキャッシュされ、ウォームインスタンスでは呼び出しをまたいで再利用される。
+
+    Returns:
+        Resource: Indexing APIのサービスオブジェクト
+    """
+    return build("indexing", "v3", credentials=get_indexing_credentials())
+
+
+@functools.cache
+def get_blogger_service(api_key: str) -> Resource:
+    """Blogger APIのサービスオブジェクトを取得する。
+
+    取得結果はAPIキーごとにキャッシュされ、ウォームインスタンスでは呼び出しをまたいで
+    再利用される。
+
+    Args:
+        api_key (str): APIキー
+
+    Returns:
+        Resource: Blogger APIのサービスオブジェクト
+    """
+    return build("blogger", "v3", developerKey=api_key)
 
 
-def get_pending_url_docs(batch_size: int) -> list[firestore.DocumentSnapshot]:
+def get_pending_url_docs(
+    batch_size: int,
+    cursor: firestore.DocumentSnapshot | None = None,
+) -> tuple[list[firestore.DocumentSnapshot], firestore.DocumentSnapshot | None]:
     """Firestoreから送信が古い、もしくは未送信のURL通知ドキュメントを指定数取得する。
 
     Args:
         batch_size (int): 取得するドキュメント数の上限
+        cursor (firestore.DocumentSnapshot | None):
+            前回取得した最後のドキュメント。指定時はその次から取得する
 
     Returns:
-        List[firestore.DocumentSnapshot]: 取得したドキュメントリスト
+        Tuple[List[firestore.DocumentSnapshot], firestore.DocumentSnapshot | None]:
+            取得したドキュメントリストと、続きを取得するためのカーソル
+            (取得件数が0件の場合はNone)
     """
-    docs = (
+    # カーソルとして使えるよう、並び順のキーであるlast_sentも取得対象に含める
+    query = (
         db.collection("url_notifications")
+        .select(["url", "last_sent"])
         .order_by("last_sent")
         .limit(batch_size)
-        .stream()
     )
-    return list(docs)
+    if cursor is not None:
+        query = query.start_after(cursor)
+    docs = list(query.stream())
+    return docs, docs[-1] if docs else None
 
 
-def update_last_sent_timestamp(doc_ref: firestore.DocumentReference) -> None:
-    """Firestoreのドキュメントのlast_sentフィールドをサーバータイムスタンプで更新する。
+def new_indexing_http() -> AuthorizedHttp:
+    """Indexing APIへのバッチリクエスト用に、認証済みのHTTP接続を作成する。
 
-    Args:
-        doc_ref (firestore.DocumentReference): 更新対象のドキュメント参照
+    作成した接続はindexing_http_poolで再利用されるため、認証情報は常に
+    get_indexing_credentials()のものを使用する。
+
+    Returns:
+        AuthorizedHttp: タイムアウトを設定した認証済みのHTTP接続
     """
-    doc_ref.update({"last_sent": firestore.SERVER_TIMESTAMP})
+    return AuthorizedHttp(
+        get_indexing_credentials(),
+        http=httplib2.Http(timeout=INDEXING_HTTP_TIMEOUT_SECONDS),
+    )
+
 
+def execute_indexing_batch(
+    urls: list[str],
+    indexing_service: Resource,
+) -> list[tuple[bool, int, str]]:
+    """インデックス登録APIにURL更新通知を1回のバッチリクエストで送信する。
 
-def send_indexing_notification(
-    url: str,
-    authed_session: AuthorizedSession,
-) -> tuple[bool, int, str]:
-    """インデックス登録APIにURL更新通知を送信する。
+    HTTPエラー・バッチレスポンスの形式不正・通信エラーでバッチリクエスト自体が
+    失敗した場合や、レスポンスに結果が含まれなかったURLは送信失敗として返す。
+    これらの失敗では例外を送出しないため、分割送信された他のバッチの結果には
+    影響しない。
 
     Args:
-        url (str): 通知対象のURL
-        authed_session (AuthorizedSession): 認証済みHTTPセッション
+        urls (List[str]): 通知対象のURLリスト(INDEXING_BATCH_LIMIT件以下)
+        indexing_service (Resource): Indexing APIのサービスオブジェクト
 
     Returns:
-        Tuple[bool, int, str]: (送信成功か, HTTPステータスコード, レスポンステキスト)
+        List[Tuple[bool, int, str]]:
+            urlsと同じ順序で並べた
+            (送信成功か, HTTPステータスコード, レスポンステキスト)のリスト
     """
-    payload = {"url": url, "type": "URL_UPDATED"}
-    response = authed_session.post(ENDPOINT, json=payload)
-    success = response.status_code == HTTP_STATUS_OK
-    if success:
-        print(f"通知送信成功: URL={url} ステータスコード={response.status_code}")
-    else:
-        print(
-            f"通知送信失敗: URL={url} ステータスコード={response.status_code} レスポンス={response.text}",  # noqa: E501
+    responses: dict[int, tuple[bool, int, str]] = {}
+
+    def callback(
+        request_id: str,
+        response: dict[str, Any],
+        exception: HttpError | None,
+    ) -> None:
+        # 各リクエストの結果を受け取る。同じURLが重複しても区別できるよう、
+        # request_idにはurls内の位置を指定している
+        index = int(request_id)
+        if exception is None:
+            logger.info(
+                "通知送信成功: URL=%s ステータスコード=%s",
+                urls[index],
+                HTTP_STATUS_OK,
+            )
+            responses[index] = (
+                True,
+                HTTP_STATUS_OK,
+                json.dumps(response, ensure_ascii=False),
+            )
+        else:
+            status_code = exception.resp.status
+            text = exception.content.decode("utf-8", errors="replace")
+            logger.warning(
+                "通知送信失敗: URL=%s ステータスコード=%s レスポンス=%s",
+                urls[index],
+                status_code,
+                text,
+            )
+            responses[index] = (False, status_code, text)
+
+    batch = indexing_service.new_batch_http_request(callback=callback)
+    for index, url in enumerate(urls):
+        batch.add(
+            indexing_service.urlNotifications().publish(
+                body={"url": url, "type": "URL_UPDATED"},
+            ),
+            request_id=str(index),
         )
-    return success, response.status_code, response.text
+    # httplib2.Httpはスレッドセーフではないため、実行中のバッチ間では共有しない
+    try:
+        http = indexing_http_pool.get_nowait()
+    except queue.Empty:
+        http = new_indexing_http()
+    try:
+        batch.execute(http=http)
+    except BatchError as e:
+        # バッチのレスポンス形式が不正な場合。respやcontentが設定されないことがある
+        status_code = getattr(e.resp, "status", HTTP_STATUS_NO_RESPONSE)
+        text = e.reason
+    except HttpError as e:
+        status_code = e.resp.status
+        text = e.content.decode("utf-8", errors="replace")
+    except (httplib2.HttpLib2Error, OSError) as e:
+        # 接続エラーやタイムアウトなど、HTTPレスポンスを受信できなかった場合
+        status_code, text = HTTP_STATUS_NO_RESPONSE, str(e) or type(e).__name__
+    else:
+        if len(responses) == len(urls):
+            return [responses[index] for index in range(len(urls))]
+        status_code = HTTP_STATUS_NO_RESPONSE
+        text = "バッチレスポンスに結果が含まれていません。"
+    finally:
+        indexing_http_pool.put(http)
+
+    # 結果を受け取れなかったURLを送信失敗として記録する
+    logger.warning(
+        "バッチリクエスト送信失敗: 件数=%s ステータスコード=%s レスポンス=%s",
+        len(urls) - len(responses),
+        status_code,
+        text,
+    )
+    return [
+        responses.get(index, (False, status_code, text)) for index in range(len(urls))
+    ]
+
+
+def send_indexing_notifications(
+    urls: list[str],
+    indexing_service: Resource,
+) -> list[tuple[bool, int, str]]:
+    """インデックス登録APIにURL更新通知をバッチリクエストで一括送信する。
+
+    通知数がINDEXING_BATCH_LIMITを超える場合は複数のバッチリクエストに分割し、
+    INDEXING_MAX_WORKERS件まで並列に送信する。
+
+    Args:
+        urls (List[str]): 通知対象のURLリスト
+        indexing_service (Resource): Indexing APIのサービスオブジェクト
+
+    Returns:
+        List[Tuple[bool, int, str]]:
+            urlsと同じ順序で並べた
+            (送信成功か, HTTPステータスコード, レスポンステキスト)のリスト
+    """
+    responses: list[tuple[bool, int, str]] = []
+    with ThreadPoolExecutor(max_workers=INDEXING_MAX_WORKERS) as executor:
+        futures = [
+            executor.submit(
+                execute_indexing_batch,
+                urls[i : i + INDEXING_BATCH_LIMIT],
+                indexing_service,
+            )
+            for i in range(0, len(urls), INDEXING_BATCH_LIMIT)
+        ]
+        for future in futures:
+            responses.extend(future.result())
+    return responses
+
+
+def commit_batch(batch: firestore.WriteBatch) -> None:
+    """Firestoreのバッチ書き込みを、一時的なエラー時は再試行しつつコミットする。
+
+    Args:
+        batch (firestore.WriteBatch): コミット対象のバッチ
+    """
+    batch.commit(retry=COMMIT_RETRY)
+
+
+def update_last_sent_timestamps(doc_refs: list[firestore.DocumentReference]) -> None:
+    """Firestoreのドキュメントのlast_sentフィールドをサーバータイムスタンプで更新する。
+
+    更新は1回のバッチ書き込みでまとめてコミットするため、
+    doc_refsはFIRESTORE_BATCH_LIMIT件以下で指定すること。
+
+    Args:
+        doc_refs (List[firestore.DocumentReference]): 更新対象のドキュメント参照リスト
+    """
+    batch = db.batch()
+    for doc_ref in doc_refs:
+        batch.update(doc_ref, {"last_sent": firestore.SERVER_TIMESTAMP})
+    commit_batch(batch)
 
 
 def register_blog_urls_to_firestore(blog_id: str, api_key: str) -> None:
@@ -132,94 +455,150 @@ def register_blog_urls_to_firestore(blog_id: str, api_key: str) -> None:
         blog_id (str): ブログID
         api_key (str): APIキー
     """
-    service = build("blogger", "v3", developerKey=api_key)
+    service = get_blogger_service(api_key)
     page_token: str | None = None
-
-    while True:
-        posts_response: dict[str, Any] = (
-            service.posts().list(blogId=blog_id, pageToken=page_token).execute()
-        )
-        for post in posts_response.get("items", []):
-            url: str = post["url"]
-            doc_id = encode_doc_id(url)
-            doc_ref = db.collection("url_notifications").document(doc_id)
-
-            # ドキュメントの存在チェック
-            doc = doc_ref.get()
-            if doc.exists:
-                # 既存ドキュメントにlast_sentがなければ初期化
-                data = doc.to_dict()
+    commit_futures: list[Future[None]] = []
+
+    with ThreadPoolExecutor(max_workers=COMMIT_THREADS) as executor:
+        batch = db.batch()
+        while True:
+            # 必要なフィールドのみを、1ページあたり最大件数で取得する
+            posts_response: dict[str, Any] = (
+                service.posts()
+                .list(
+                    blogId=blog_id,
+                    pageToken=page_token,
+                    maxResults=BLOGGER_MAX_RESULTS,
+                    fields="nextPageToken,items/url",
+                )
+                .execute()
+            )
+            urls: list[str] = [post["url"] for post in posts_response.get("items", [])]
+            doc_refs = [
+                db.collection("url_notifications").document(encode_doc_id(url))
+                for url in urls
+            ]
+
+            # ページ内のドキュメントの存在チェックを1回のリクエストでまとめて行う
+            snapshots = (
+                {doc.reference.path: doc for doc in db.get_all(doc_refs)}
+                if doc_refs
+                else {}
+            )
+            for url, doc_ref in zip(urls, doc_refs, strict=True):
+                data = snapshots[doc_ref.path].to_dict() or {}
                 if "last_sent" not in data:
-                    doc_ref.update({"last_sent": firestore.SERVER_TIMESTAMP})
-                # URLは念のため更新(merge=Trueにより上書きは避ける)  # noqa: ERA001
-                doc_ref.set({"url": url}, merge=True)
-            else:
-                # 新規登録時はlast_sentも初期化して登録
-                doc_ref.set({"url": url, "last_sent": firestore.SERVER_TIMESTAMP})
+                    # 新規登録時またはlast_sent未設定時はlast_sentも初期化して登録
+                    batch.set(
+                        doc_ref,
+                        {"url": url, "last_sent": firestore.SERVER_TIMESTAMP},
+                        merge=True,
+                    )
+                elif data.get("url") != url:
+                    # URLのみ更新(merge=Trueにより既存のlast_sentは保持)  # noqa: ERA001
+                    batch.set(doc_ref, {"url": url}, merge=True)
+                else:
+                    # 登録済みで変更がない場合は書き込みを行わない
+                    continue
+
+                # 書き込み数が上限に達したらまとめてコミット
+                if len(batch) >= FIRESTORE_BATCH_LIMIT:
+                    commit_futures.append(executor.submit(commit_batch, batch))
+                    batch = db.batch()
+
+                logger.info("FirestoreにURL登録: %s", url)
+
+            # ページごとのコミットは別スレッドで行い、次ページの取得と並行させる
+            if len(batch) > 0:
+                commit_futures.append(executor.submit(commit_batch, batch))
+                batch = db.batch()
+
+            page_token = posts_response.get("nextPageToken")
+            if not page_token:
+                break
+
+        # 全コミットの完了を待機し、失敗したコミットがあれば例外を送出する
+        for future in commit_futures:
+            future.result()
+
+
+def is_smtp_connection_alive(server: smtplib.SMTP) -> bool:
+    """SMTP接続にNOOPを送信し、接続が有効か確認する。
+
+    Args:
+        server (smtplib.SMTP): 確認対象のSMTP接続
 
-            print(f"FirestoreにURL登録: {url}")
-        page_token = posts_response.get("nextPageToken")
-        if not page_token:
-            break
+    Returns:
+        bool: 接続が有効な場合はTrue
+    """
+    try:
+        status, _ = server.noop()
+    except (smtplib.SMTPException, OSError):
+        # 切断済みの接続や、応答のない接続(タイムアウト)は無効とみなす
+        return False
+    return status == SMTP_STATUS_OK
+
+
+def get_smtp_connection(mail_from: str, mail_password: str) -> smtplib.SMTP:
+    """ログイン済みのSMTP接続を取得する。
+
+    有効な接続が残っていればそれを再利用し、なければ接続・STARTTLS・ログインを行う。
+
+    Args:
+        mail_from (str): ログインに使用する送信元メールアドレス
+        mail_password (str): 送信元メールアドレスのアプリパスワード
+
+    Returns:
+        smtplib.SMTP: ログイン済みのSMTP接続
+    """
+    server = smtp_connections.get(mail_from)
+    if server is not None:
+        if is_smtp_connection_alive(server):
+            return server
+        logger.info("SMTP接続が切断されているため再接続します。")
+        server.close()
+
+    server = smtplib.SMTP(SMTP_SERVER, SMTP_PORT, timeout=SMTP_TIMEOUT_SECONDS)
+    try:
+        server.starttls()
+        server.login(mail_from, mail_password)
+    except Exception:
+        # ログインまで完了しなかった接続は再利用せずに閉じる
+        server.close()
+        raise
+    smtp_connections[mail_from] = server
+    return server
 
 
 def build_summary_email_body_html(results: list[NotificationResult]) -> str:
     """全URL通知結果をまとめたHTMLメール本文を生成する(装飾付き)。
 
+    URLやメッセージなどの値はHTMLエスケープして埋め込む。
+
     Args:
         results (List[NotificationResult]): 通知結果リスト
 
     Returns:
         str: HTML本文
     """
-    rows = "".join(
-        f"<tr style='background-color:{'#eafbea' if r['status'] == 'success' else '#ffeaea'};'>"  # noqa: E501
-        f"<td style='word-break:break-all;'>{r['url']}</td>"
-        f"<td style='font-weight:bold;color:{'#218838' if r['status'] == 'success' else '#c82333'};'>{'成功' if r['status'] == 'success' else '失敗'}</td>"  # noqa: E501
-        f"<td>{r['http_status']}</td>"
-        f"<td><pre style='white-space:pre-wrap;margin:0;font-family:inherit;'>{r['message']}</pre></td>"  # noqa: E501
-        f"</tr>"
-        for r in results
-    )
-    return f"""
-    <html>
-      <head>
-        <style>
-          table.result-table {{
-            border-collapse: separate;
-            border-spacing: 0;
-            width: 100%;
-            font-family: 'Segoe UI', 'Meiryo', sans-serif;
-            box-shadow: 0 2px 8px #eee;
-            border-radius: 8px;
-            overflow: hidden;
-          }}
-          .result-table th, .result-table td {{
-            border: 1px solid #ccc;
-            padding: 8px 12px;
-            text-align: left;
-          }}
-          .result-table th {{
-            background: #4f81bd;
-            color: #fff;
-            font-weight: bold;
-          }}
-          .result-table tr:hover {{
-            background: #f1f7ff;
-          }}
-        </style>
-      </head>
-      <body>
-        <h2 style='font-family:Segoe UI,Meiryo,sans-serif;'>インデックス通知バッチ結果</h2>
-        <table class='result-table'>
-          <tr>
-            <th>URL</th><th>結果</th><th>HTTPステータス</th><th>メッセージ</th>
-          </tr>
-          {rows}
-        </table>
-      </body>
-    </html>
-    """  # noqa: E501
+    return SUMMARY_EMAIL_TEMPLATE.render(results=results)
+
+
+def send_summary_email(env: EnvVars, subject: str, body_html: str) -> None:
+    """通知結果をまとめたHTMLメールを送信する。
+
+    Args:
+        env (EnvVars): 送信元・送信先のメールアドレスなどを含む環境変数
+        subject (str): メールの件名
+        body_html (str): HTML本文
+    """
+    msg = EmailMessage()
+    msg["From"] = env["mail_from"]
+    msg["To"] = env["mail_to"]
+    msg["Subject"] = subject
+    msg.set_content(body_html, subtype="html")
+    server = get_smtp_connection(env["mail_from"], env["mail_password"])
+    server.send_message(msg)
 
 
 def main(request: Any) -> tuple[dict[str, Any], int]:  # noqa: ANN401, ARG001
@@ -237,73 +616,114 @@ def main(request: Any) -> tuple[dict[str, Any], int]:  # noqa: ANN401, ARG001
     try:
         env = get_env_vars()
     except OSError as e:
-        print(str(e))
+        logger.error("%s", e)  # noqa: TRY400
         return {"error": str(e)}, 500
 
-    print(f"認証セッションを初期化中。スコープ: {SCOPES}")
-    credentials, _ = google.auth.default(scopes=SCOPES)
-    authed_session = AuthorizedSession(credentials)
-    print(f"認証セッションの取得に成功しました。スコープ: {SCOPES}")
-
-    # Blogger APIからURL一覧をFirestoreに登録
-    print("Blogger APIからURL一覧を取得し、Firestoreに登録します。")
-    register_blog_urls_to_firestore(
-        blog_id=env["blog_id"],
-        api_key=env["blogger_api_key"],
-    )
+    with ThreadPoolExecutor(max_workers=MAIN_MAX_WORKERS) as executor:
+        # 互いに依存しないネットワーク処理は別スレッドで並行して行う
+        logger.info("認証情報を初期化中。スコープ: %s", SCOPES)
+        indexing_service_future = executor.submit(get_indexing_service)
+        smtp_future = executor.submit(
+            get_smtp_connection,
+            env["mail_from"],
+            env["mail_password"],
+        )
 
-    # Firestoreから送信待ちURLを取得
-    print(f"Firestoreから送信待ちのURLを最大{BATCH_SIZE}件取得します。")
-    pending_docs = get_pending_url_docs(batch_size=BATCH_SIZE)
-
-    results: list[NotificationResult] = []
-    for doc in pending_docs:
-        url = doc.to_dict().get("url")
-        if not url:
-            print("URLフィールドが存在しないドキュメントをスキップしました。")
-            continue
-        doc_ref = doc.reference
-        print(f"インデックス通知を送信中: {url}")
-        success, status_code, message = send_indexing_notification(url, authed_session)
-        if success:
-            update_last_sent_timestamp(doc_ref)
-            results.append(
-                {
-                    "url": url,
-                    "status": "success",
-                    "http_status": status_code,
-                    "message": "OK",
-                },
+        # Blogger APIからURL一覧をFirestoreに登録
+        logger.info("Blogger APIからURL一覧を取得し、Firestoreに登録します。")
+        register_blog_urls_to_firestore(
+            blog_id=env["blog_id"],
+            api_key=env["blogger_api_key"],
+        )
+
+        # Firestoreから送信待ちURLを取得
+        logger.info("Firestoreから送信待ちのURLを最大%s件取得します。", BATCH_SIZE)
+        pending_docs, _ = get_pending_url_docs(batch_size=BATCH_SIZE)
+
+        targets: list[tuple[str, firestore.DocumentReference]] = []
+        for doc in pending_docs:
+            # ドキュメント全体を辞書に変換せず、urlフィールドのみを取得する
+            try:
+                url = doc.get("url")
+            except KeyError:
+                url = None
+            if not url:
+                logger.warning(
+                    "URLフィールドが存在しないドキュメントをスキップしました。",
+                )
+                continue
+            targets.append((url, doc.reference))
+
+        indexing_service = indexing_service_future.result()
+        logger.info("認証情報の取得に成功しました。スコープ: %s", SCOPES)
+
+        # 全URLの通知を1回のバッチリクエストで送信
+        logger.info("インデックス通知を一括送信中: %s件", len(targets))
+        responses = send_indexing_notifications(
+            [url for url, _ in targets],
+            indexing_service,
+        )
+
+        results: list[NotificationResult] = []
+        has_error = False
+        success_refs: list[firestore.DocumentReference] = []
+        for (url, doc_ref), (success, status_code, message) in zip(
+            targets,
+            responses,
+            strict=True,
+        ):
+            has_error |= not success
+            if success:
+                success_refs.append(doc_ref)
+                results.append(
+                    {
+                        "url": url,
+                        "status": "success",
+                        "http_status": status_code,
+                        "message": "OK",
+                    },
+                )
+            else:
+                results.append(
+                    {
+                        "url": url,
+                        "status": "failed",
+                        "http_status": status_code,
+                        "message": message,
+                    },
+                )
+
+        # 送信成功したURLのlast_sentをメール送信と並行してまとめて更新
+        commit_futures = [
+            executor.submit(
+                update_last_sent_timestamps,
+                success_refs[i : i + FIRESTORE_BATCH_LIMIT],
             )
-        else:
-            results.append(
-                {
-                    "url": url,
-                    "status": "failed",
-                    "http_status": status_code,
-                    "message": message,
-                },
+            for i in range(0, len(success_refs), FIRESTORE_BATCH_LIMIT)
+        ]
+
+        # まとめてメール通知
+        subject_prefix = "【エラー】" if has_error else "【完了】"
+        subject = f"{subject_prefix}インデックス通知バッチ結果: {len(results)}件"
+        body_html = build_summary_email_body_html(results)
+        # 事前に開始した接続処理の完了を待つ。認証エラーの場合は同じ認証情報で
+        # 再ログインしても失敗するため送信を中止し、接続レベルの失敗のみ再接続する
+        smtp_error = smtp_future.exception()
+        if isinstance(smtp_error, smtplib.SMTPAuthenticationError):
+            logger.error(
+                "バッチ結果メール送信失敗: %s",
+                subject,
+                exc_info=smtp_error,
             )
-        time.sleep(SLEEP_SECONDS)  # API制限緩和のため待機
+        else:
+            try:
+                send_summary_email(env, subject, body_html)
+                logger.info("バッチ結果メール送信成功: %s", subject)
+            except Exception:
+                logger.exception("バッチ結果メール送信失敗: %s", subject)
 
-    # まとめてメール通知
-    has_error = any(r["status"] == "failed" for r in results)
-    subject_prefix = "【エラー】" if has_error else "【完了】"
-    subject = f"{subject_prefix}インデックス通知バッチ結果: {len(results)}件"
-    body_html = build_summary_email_body_html(results)
-    try:
-        msg = MIMEMultipart()
-        msg["From"] = env["mail_from"]
-        msg["To"] = env["mail_to"]
-        msg["Subject"] = subject
-        msg.attach(MIMEText(body_html, "html"))
-        with smtplib.SMTP(SMTP_SERVER, SMTP_PORT) as server:
-            server.starttls()
-            server.login(env["mail_from"], env["mail_password"])
-            server.send_message(msg)
-        print(f"バッチ結果メール送信成功: {subject}")
-    except Exception as e:
-        print(f"バッチ結果メール送信失敗: {subject} エラー={e}")
-
-    print("処理結果:", results)
+        for future in commit_futures:
+            future.result()
+
+    logger.info("処理結果: %s", results)
     return {"results": results}, 200